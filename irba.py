@@ -1,60 +1,168 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import polars as pl
+from scipy.sparse import csr_matrix
 import os
-import matplotlib.pyplot as plt
 
 # ----------------- Load Data from GitHub -----------------
 base_url = "https://raw.githubusercontent.com/paarishaemilie/IRBA/main/"
 
-claim_basic = pd.read_csv(base_url + "Claim_Basic.csv")
-claim_diagnosis = pd.read_csv(base_url + "Claim_Diagnosis.csv")
-claim_doctor = pd.read_csv(base_url + "Claim_Doctor.csv")
-doctor_info = pd.read_csv(base_url + "Doctor_Info.csv")
-hospital_info = pd.read_csv(base_url + "Hospital_Info.csv")
-policy_info = pd.read_csv(base_url + "Policy_Info.csv")
-
-# ----------------- Preprocessing -----------------
-claim_basic["Admission Date"] = pd.to_datetime(claim_basic["Admission Date"], errors="coerce")
-claim_basic["Discharged Date"] = pd.to_datetime(claim_basic["Discharged Date"], errors="coerce")
-claim_basic["Length_of_Stay"] = (claim_basic["Discharged Date"] - claim_basic["Admission Date"]).dt.days + 1
-claim_basic.loc[claim_basic["Length_of_Stay"] < 0, "Length_of_Stay"] = None
-
-policy_info["Inception Date"] = pd.to_datetime(policy_info["Inception Date"], errors="coerce")
-policy_info["Age"] = policy_info["Inception Date"].dt.year - policy_info["Birth Year"]
-policy_info.loc[policy_info["Age"] < 0, "Age"] = None
-
-# ----------------- Standardize Doctor Specialty -----------------
-doctor_info["Specialty"] = doctor_info["Specialty"].str.strip().str.title()
-# Specifically ensure "Paediatrician" is consistent
-doctor_info["Specialty"] = doctor_info["Specialty"].replace({
-    "Paediatrician": "Paediatrician",
-    "Pediatrician": "Paediatrician",
-    "Paediatrics": "Paediatrician"
-})
-
-# ---- Merge Summaries ----
-diagnosis_count = claim_diagnosis.groupby("Claim ID")["Diagnosis"].count().reset_index(name="Num_Diagnoses")
-doctor_count = claim_doctor.groupby("Claim ID")["Doctor ID"].count().reset_index(name="Num_Doctors")
-
-master = claim_basic.copy()
-master = pd.merge(master, diagnosis_count, on="Claim ID", how="left")
-master = pd.merge(master, doctor_count, on="Claim ID", how="left")
-master = pd.merge(master, policy_info, on="Policy ID", how="left")
-master = pd.merge(master, hospital_info, on="Hospital ID", how="left")
-
-# ---- Rule-based Flags ----
-master["flag_many_diagnoses"] = master.get("Num_Diagnoses", 0) > 3
-master["flag_shortstay_manydiag"] = (master.get("Length_of_Stay", 0) <= 2) & (master.get("Num_Diagnoses", 0) > 2)
-master["flag_longstay_onediag"] = (master.get("Length_of_Stay", 0) > 7) & (master.get("Num_Diagnoses", 0) == 1)
-master["flag_manydoctors"] = master.get("Num_Doctors", 0) > 2
-master["flag_age_missing"] = master["Age"].isna()
-
-# Collect flagged IDs
-rule_flags = [col for col in master.columns if col.startswith("flag_")]
-claims_per_rule = {rule: master.loc[master[rule] == True, "Claim ID"].tolist() for rule in rule_flags}
-hospitals_per_rule = {rule: master.loc[master[rule] == True, "Hospital ID"].unique().tolist() for rule in rule_flags}
-doctors_per_rule = {rule: master.loc[master[rule] == True, "Num_Doctors"].tolist() for rule in rule_flags}
-agents_per_rule = {rule: master.loc[master[rule] == True, "Agent"].unique().tolist() for rule in rule_flags if "Agent" in master.columns}
+
+def read_csv(name, parse_dates=None):
+    """Read a CSV from the repo into Arrow-backed columns with the pyarrow engine."""
+    df = pd.read_csv(base_url + name, engine="pyarrow", dtype_backend="pyarrow",
+                     parse_dates=parse_dates, cache_dates=True)
+    # parse_dates leaves a column as strings if any value is malformed; coerce those values to NaT
+    for col in parse_dates or []:
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def unpack_flags(flags, rule_flags):
+    """Expand the packed "flags" bitmask into one 0/1 uint8 column per rule."""
+    packed = flags.fillna(0).to_numpy(dtype=np.uint8)[:, None]
+    bits = np.unpackbits(packed, axis=1, bitorder="little")[:, :len(rule_flags)]
+    return pd.DataFrame(bits, columns=rule_flags, index=flags.index)
+
+
+def flag_counts_by(keys, flag_mat, rule_flags):
+    """Per-group rule counts as one sparse product: a group-indicator matrix times the 0/1 flag matrix."""
+    codes, groups = pd.factorize(keys, sort=True)
+    rows = np.flatnonzero(codes >= 0)  # rows with a missing key belong to no group, as in groupby
+    indicator = csr_matrix((np.ones(len(rows), dtype=np.uint32), (codes[rows], rows)), shape=(len(groups), len(codes)))
+    return pd.DataFrame(indicator @ flag_mat, index=pd.Index(groups, name=keys.name), columns=rule_flags)
+
+
+def top_n(df, col, n=10):
+    """Rows with the n largest values of col, largest first, via a partial sort instead of a full one."""
+    values = df[col].to_numpy()
+    idx = np.argpartition(values, len(values) - n)[-n:] if len(values) > n else np.arange(len(values))
+    return df.iloc[idx[np.argsort(values[idx])[::-1]]]
+
+
+@st.cache_data(show_spinner=False)
+def load_and_prepare() -> dict:
+    """Load all CSVs and build the master table and rule flags (cached across reruns)."""
+    claim_basic = read_csv("Claim_Basic.csv", parse_dates=["Admission Date", "Discharged Date"])
+    claim_diagnosis = read_csv("Claim_Diagnosis.csv")
+    claim_doctor = read_csv("Claim_Doctor.csv")
+    doctor_info = read_csv("Doctor_Info.csv")
+    hospital_info = read_csv("Hospital_Info.csv")
+    policy_info = read_csv("Policy_Info.csv", parse_dates=["Inception Date"])
+
+    # ----------------- Preprocessing -----------------
+    # Subtract whole-day numbers directly rather than going through timedelta64[ns]
+    admitted = claim_basic["Admission Date"].to_numpy().astype("datetime64[D]")
+    discharged = claim_basic["Discharged Date"].to_numpy().astype("datetime64[D]")
+    los = discharged.view("i8") - admitted.view("i8") + 1
+    invalid = np.isnat(admitted) | np.isnat(discharged) | (los < 0)
+    claim_basic["Length_of_Stay"] = pd.arrays.IntegerArray(los.astype(np.int32), invalid)
+
+    policy_info["Age"] = policy_info["Inception Date"].dt.year - policy_info["Birth Year"]
+    policy_info.loc[policy_info["Age"] < 0, "Age"] = None
+
+    # ----------------- Standardize Doctor Specialty -----------------
+    spec = doctor_info["Specialty"].str.strip().str.title()
+    # Specifically ensure "Paediatrician" is consistent
+    spec = spec.mask(spec.isin({"Pediatrician", "Paediatrics"}), "Paediatrician")
+    doctor_info["Specialty"] = spec.astype("category")
+
+    # Low-cardinality labels as categoricals so groupbys work on integer codes
+    for df, cols in [(policy_info, ["Gender", "Product", "Agent"]), (hospital_info, ["Location"])]:
+        df[cols] = df[cols].astype("category")
+
+    # ---- Merge Summaries & Rule-based Flags ----
+    # Built as one Polars lazy query so the counts, joins and flags share a single multi-threaded plan
+    rules = {
+        "flag_many_diagnoses": pl.col("Num_Diagnoses") > 3,
+        "flag_shortstay_manydiag": (pl.col("Length_of_Stay") <= 2) & (pl.col("Num_Diagnoses") > 2),
+        "flag_longstay_onediag": (pl.col("Length_of_Stay") > 7) & (pl.col("Num_Diagnoses") == 1),
+        "flag_manydoctors": pl.col("Num_Doctors") > 2,
+        "flag_age_missing": pl.col("Age").is_null(),
+    }
+    # Pack the rules into a single uint8 column: bit i is set when rule_flags[i] fires
+    rule_flags = list(rules)
+    flags = pl.sum_horizontal(hit.fill_null(False).cast(pl.UInt8) * (1 << bit) for bit, hit in enumerate(rules.values()))
+
+    diagnosis_count = pl.from_pandas(claim_diagnosis).lazy().group_by("Claim ID").len("Num_Diagnoses")
+    doctor_count = pl.from_pandas(claim_doctor).lazy().group_by("Claim ID").len("Num_Doctors")
+    master = (
+        pl.from_pandas(claim_basic).lazy()
+        .join(diagnosis_count, on="Claim ID", how="left", maintain_order="left")
+        .join(doctor_count, on="Claim ID", how="left", maintain_order="left")
+        .join(pl.from_pandas(policy_info).lazy(), on="Policy ID", how="left", maintain_order="left")
+        .join(pl.from_pandas(hospital_info).lazy(), on="Hospital ID", how="left", maintain_order="left")
+        .with_columns(flags=flags.cast(pl.UInt8))
+        .collect()
+        .to_pandas()
+    )
+
+    # Collect flagged IDs, slicing each column's array once per rule
+    flag_mat = unpack_flags(master["flags"], rule_flags).to_numpy(dtype=bool)
+    claim_ids, hospital_ids, num_doctors = (master[col].to_numpy() for col in ["Claim ID", "Hospital ID", "Num_Doctors"])
+    agents = master["Agent"].array if "Agent" in master.columns else None
+    claims_per_rule, hospitals_per_rule, doctors_per_rule, agents_per_rule = {}, {}, {}, {}
+    for i, rule in enumerate(rule_flags):
+        mask = flag_mat[:, i]
+        claims_per_rule[rule] = claim_ids[mask]
+        hospitals_per_rule[rule] = pd.unique(hospital_ids[mask])
+        doctors_per_rule[rule] = num_doctors[mask]
+        if agents is not None:
+            agents_per_rule[rule] = pd.unique(agents[mask])
+
+    return {
+        "claim_basic": claim_basic,
+        "claim_diagnosis": claim_diagnosis,
+        "claim_doctor": claim_doctor,
+        "doctor_info": doctor_info,
+        "hospital_info": hospital_info,
+        "policy_info": policy_info,
+        "master": master,
+        "rule_flags": rule_flags,
+        "claims_per_rule": claims_per_rule,
+        "hospitals_per_rule": hospitals_per_rule,
+        "doctors_per_rule": doctors_per_rule,
+        "agents_per_rule": agents_per_rule,
+    }
+
+
+data = load_and_prepare()
+claim_basic = data["claim_basic"]
+claim_diagnosis = data["claim_diagnosis"]
+claim_doctor = data["claim_doctor"]
+doctor_info = data["doctor_info"]
+hospital_info = data["hospital_info"]
+policy_info = data["policy_info"]
+master = data["master"]
+rule_flags = data["rule_flags"]
+claims_per_rule = data["claims_per_rule"]
+hospitals_per_rule = data["hospitals_per_rule"]
+doctors_per_rule = data["doctors_per_rule"]
+agents_per_rule = data["agents_per_rule"]
+
+
+# ----------------- Charts -----------------
+def bar_chart(values, title, color=None, sort=True):
+    """Titled st.bar_chart; Vega-Lite draws it in the browser, so there is no Python rendering cost."""
+    st.markdown(f"**{title}**")
+    st.bar_chart(values, color=color, sort=sort)
+
+
+def hist_chart(values, bins, title):
+    """Histogram as a bar chart of np.histogram bin counts, one bar per bin in order."""
+    counts, edges = np.histogram(np.asarray(values, dtype=float), bins=bins)
+    edges = edges.round(1)
+    labels = [f"{lo:g}–{hi:g}" for lo, hi in zip(edges[:-1], edges[1:])]
+    bar_chart(pd.Series(counts, index=labels, name="Count"), title, sort=False)
+
+
+# ----------------- Downloads -----------------
+@st.cache_data(show_spinner=False)
+def ids_to_csv(ids: np.ndarray) -> bytes:
+    """One-column Claim ID CSV, built once per distinct ID set instead of via DataFrame.to_csv on every rerun."""
+    return ("\n".join(["Claim ID", *map(str, ids)]) + "\n").encode()
 
 
 # ----------------- Streamlit Layout -----------------
@@ -72,15 +180,15 @@ with tabs[0]:
     # Overall
     with eda_tabs[0]:
         st.subheader("Overall Dataset Shapes")
-        shapes = {
-            "Claim_Basic": claim_basic.shape,
-            "Claim_Diagnosis": claim_diagnosis.shape,
-            "Claim_Doctor": claim_doctor.shape,
-            "Doctor_Info": doctor_info.shape,
-            "Hospital_Info": hospital_info.shape,
-            "Policy_Info": policy_info.shape,
+        files = {
+            "Claim_Basic": claim_basic,
+            "Claim_Diagnosis": claim_diagnosis,
+            "Claim_Doctor": claim_doctor,
+            "Doctor_Info": doctor_info,
+            "Hospital_Info": hospital_info,
+            "Policy_Info": policy_info,
         }
-        st.dataframe(pd.DataFrame(shapes, index=["rows", "cols"]))
+        st.table({name: {"rows": df.shape[0], "cols": df.shape[1]} for name, df in files.items()})
 
         st.subheader("Summary Statistics - Claims")
         st.dataframe(claim_basic.describe(include="all"))
@@ -91,86 +199,105 @@ with tabs[0]:
         st.dataframe(claim_basic.head())
 
         # Distribution of Length of Stay
-        fig, ax = plt.subplots()
-        claim_basic["Length_of_Stay"].dropna().hist(ax=ax, bins=20)
-        ax.set_title("Distribution of Length of Stay")
-        st.pyplot(fig)
+        hist_chart(claim_basic["Length_of_Stay"].dropna(), 20, "Distribution of Length of Stay")
 
         # Top 10 Diagnoses by frequency
         top_diagnoses = claim_diagnosis["Diagnosis"].value_counts().head(10)
-        fig, ax = plt.subplots()
-        top_diagnoses.plot(kind="bar", ax=ax)
-        ax.set_title("Top 10 Diagnoses")
-        st.pyplot(fig)
+        bar_chart(top_diagnoses, "Top 10 Diagnoses", sort=False)
 
     # Policy
     with eda_tabs[2]:
         st.subheader("Policy Data Overview")
         st.dataframe(policy_info.head())
 
-        gender_count = policy_info.groupby("Gender")["Policy ID"].count().reset_index()
-        fig, ax = plt.subplots()
-        ax.bar(gender_count["Gender"], gender_count["Policy ID"])
-        ax.set_title("Gender Distribution")
-        st.pyplot(fig)
+        gender_count = policy_info.groupby("Gender", observed=True, sort=False)["Policy ID"].count()
+        bar_chart(gender_count, "Gender Distribution")
 
-        product_count = policy_info.groupby("Product")["Policy ID"].count().reset_index()
-        fig, ax = plt.subplots()
-        ax.bar(product_count["Product"], product_count["Policy ID"])
-        ax.set_title("Product Distribution")
-        st.pyplot(fig)
+        product_count = policy_info.groupby("Product", observed=True, sort=False)["Policy ID"].count()
+        bar_chart(product_count, "Product Distribution")
 
         # Age distribution
-        fig, ax = plt.subplots()
-        policy_info["Age"].dropna().hist(ax=ax, bins=20)
-        ax.set_title("Age Distribution of Policyholders")
-        st.pyplot(fig)
+        hist_chart(policy_info["Age"].dropna(), 20, "Age Distribution of Policyholders")
 
     # Hospital
     with eda_tabs[3]:
         st.subheader("Hospital Data Overview")
         st.dataframe(hospital_info.head())
 
-        location_count = hospital_info.groupby("Location")["Hospital ID"].count().reset_index()
-        fig, ax = plt.subplots()
-        ax.bar(location_count["Location"], location_count["Hospital ID"])
-        ax.set_title("Hospitals per Location")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+        location_count = hospital_info.groupby("Location", observed=True, sort=False)["Hospital ID"].count()
+        bar_chart(location_count, "Hospitals per Location")
 
     # Doctor
     with eda_tabs[4]:
         st.subheader("Doctor Data Overview")
         st.dataframe(doctor_info.head())
 
-        specialty_count = doctor_info.groupby("Specialty")["Doctor ID"].count().reset_index()
-        fig, ax = plt.subplots()
-        ax.bar(specialty_count["Specialty"], specialty_count["Doctor ID"])
-        ax.set_title("Doctors per Specialty")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+        specialty_count = doctor_info.groupby("Specialty", observed=True, sort=False)["Doctor ID"].count()
+        bar_chart(specialty_count, "Doctors per Specialty")
 
     # Agent
     with eda_tabs[5]:
         st.subheader("Top Agents by Number of Policies")
-        agent_count = policy_info.groupby("Agent")["Policy ID"].count().reset_index()
-        agent_count = agent_count.sort_values("Policy ID", ascending=False).head(10)
+        agent_count = policy_info.groupby("Agent", observed=True, sort=False)["Policy ID"].count()
+        top_agent_count = top_n(agent_count.to_frame(), "Policy ID")["Policy ID"]
 
-        fig, ax = plt.subplots()
-        ax.bar(agent_count["Agent"], agent_count["Policy ID"])
-        ax.set_title("Top 10 Agents")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+        bar_chart(top_agent_count, "Top 10 Agents", sort=False)
 
         # Distribution of policies per agent
-        fig, ax = plt.subplots()
-        policy_info.groupby("Agent")["Policy ID"].count().hist(ax=ax, bins=20)
-        ax.set_title("Distribution of Policies per Agent")
-        st.pyplot(fig)
+        hist_chart(agent_count, 20, "Distribution of Policies per Agent")
 
 # ================= Rules Tab =================
+# ---- Hospital-level ----
+@st.fragment
+def hospital_rules():
+    st.subheader("Hospital-level Rules (Top by Flags)")
+    # Count total flags per hospital
+    flag_mat = unpack_flags(master["flags"], rule_flags).to_numpy()
+    hospital_flags = flag_counts_by(master["Hospital ID"], flag_mat, rule_flags)
+    hospital_flags["Total_Flags"] = hospital_flags[rule_flags].to_numpy().sum(axis=1, dtype=np.uint32)
+    top_hospitals = top_n(hospital_flags, "Total_Flags")
+    st.dataframe(top_hospitals)
+
+    bar_chart(top_hospitals["Total_Flags"].rename(index=str), "Top 10 Hospitals by Total Flags", color="#FFA500", sort=False)
+
+
+# ---- Doctor-level ----
+@st.fragment
+def doctor_rules():
+    st.subheader("Doctor-level Rules (Top by Flags)")
+    # Sum flags per doctor using claim_doctor mapping, indexing master rows by position instead of merging
+    claim_pos = pd.Index(master["Claim ID"]).get_indexer(claim_doctor["Claim ID"])
+    linked = claim_pos >= 0
+    flags_by_claim = unpack_flags(master["flags"], rule_flags).to_numpy()
+    flag_mat = np.zeros((len(claim_doctor), len(rule_flags)), dtype=np.uint8)
+    flag_mat[linked] = flags_by_claim[claim_pos[linked]]
+    doctor_flags_sum = flag_counts_by(claim_doctor["Doctor ID"], flag_mat, rule_flags)
+    doctor_flags_sum["Total_Flags"] = doctor_flags_sum[rule_flags].to_numpy().sum(axis=1, dtype=np.uint32)
+    top_doctors = top_n(doctor_flags_sum, "Total_Flags")
+    st.dataframe(top_doctors)
+
+    bar_chart(top_doctors["Total_Flags"].rename(index=str), "Top 10 Doctors by Total Flags", color="#008000", sort=False)
+
+
+# ---- Agent-level ----
+@st.fragment
+def agent_rules():
+    st.subheader("Agent-level Rules (Top by Flags)")
+    if "Agent" in master.columns:
+        # Sum flags per agent
+        flag_mat = unpack_flags(master["flags"], rule_flags).to_numpy()
+        agent_flags = flag_counts_by(master["Agent"], flag_mat, rule_flags)
+        agent_flags["Total_Flags"] = agent_flags[rule_flags].to_numpy().sum(axis=1, dtype=np.uint32)
+        top_agents = top_n(agent_flags, "Total_Flags")
+        st.dataframe(top_agents)
+
+        bar_chart(top_agents["Total_Flags"].rename(index=str), "Top 10 Agents by Total Flags", color="#800080", sort=False)
+    else:
+        st.info("No Agent data available in this dataset.")
+
+
 with tabs[1]:
-    rule_tabs = st.tabs(["Claims", "Hospitals", "Doctors", "Agents"])
+    rule_tabs = st.tabs(["Claims", "Hospitals", "Doctors", "Agents"], key="rule_tab", on_change="rerun")
 
     # ---- Claim-level ----
     with rule_tabs[0]:
@@ -178,61 +305,21 @@ with tabs[1]:
         summary = pd.DataFrame({rule: [len(ids)] for rule, ids in claims_per_rule.items()}, index=["#Claims Flagged"])
         st.dataframe(summary)
 
-        fig, ax = plt.subplots()
-        ax.bar(claims_per_rule.keys(), [len(ids) for ids in claims_per_rule.values()])
-        ax.set_title("Claims Flagged per Rule")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
+        bar_chart(summary.loc["#Claims Flagged"], "Claims Flagged per Rule", sort=False)
 
         for rule, ids in claims_per_rule.items():
             st.write(f"**{rule}**: {len(ids)} claims flagged")
-            st.download_button(f"Download {rule} Claims", pd.DataFrame(ids, columns=["Claim ID"]).to_csv(index=False), file_name=f"{rule}_claims.csv")
+            st.download_button(f"Download {rule} Claims", ids_to_csv(ids), file_name=f"{rule}_claims.csv", mime="text/csv")
 
-    # ---- Hospital-level ----
+    # Hospital/Doctor/Agent aggregations only run while their tab is selected
     with rule_tabs[1]:
-        st.subheader("Hospital-level Rules (Top by Flags)")
-        # Count total flags per hospital
-        hospital_flags = master.groupby("Hospital ID")[rule_flags].sum()
-        hospital_flags["Total_Flags"] = hospital_flags.sum(axis=1)
-        top_hospitals = hospital_flags.sort_values("Total_Flags", ascending=False).head(10)
-        st.dataframe(top_hospitals)
-
-        fig, ax = plt.subplots()
-        ax.bar(top_hospitals.index.astype(str), top_hospitals["Total_Flags"], color="orange")
-        ax.set_title("Top 10 Hospitals by Total Flags")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
-
-    # ---- Doctor-level ----
+        if rule_tabs[1].open:
+            hospital_rules()
+
     with rule_tabs[2]:
-        st.subheader("Doctor-level Rules (Top by Flags)")
-        # Sum flags per doctor using claim_doctor mapping
-        doctor_flags = claim_doctor.merge(master[["Claim ID"] + rule_flags], on="Claim ID", how="left")
-        doctor_flags_sum = doctor_flags.groupby("Doctor ID")[rule_flags].sum()
-        doctor_flags_sum["Total_Flags"] = doctor_flags_sum.sum(axis=1)
-        top_doctors = doctor_flags_sum.sort_values("Total_Flags", ascending=False).head(10)
-        st.dataframe(top_doctors)
-
-        fig, ax = plt.subplots()
-        ax.bar(top_doctors.index.astype(str), top_doctors["Total_Flags"], color="green")
-        ax.set_title("Top 10 Doctors by Total Flags")
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
-
-    # ---- Agent-level ----
+        if rule_tabs[2].open:
+            doctor_rules()
+
     with rule_tabs[3]:
-        st.subheader("Agent-level Rules (Top by Flags)")
-        if "Agent" in master.columns:
-            # Sum flags per agent
-            agent_flags = master.groupby("Agent")[rule_flags].sum()
-            agent_flags["Total_Flags"] = agent_flags.sum(axis=1)
-            top_agents = agent_flags.sort_values("Total_Flags", ascending=False).head(10)
-            st.dataframe(top_agents)
-
-            fig, ax = plt.subplots()
-            ax.bar(top_agents.index.astype(str), top_agents["Total_Flags"], color="purple")
-            ax.set_title("Top 10 Agents by Total Flags")
-            plt.xticks(rotation=45)
-            st.pyplot(fig)
-        else:
-            st.info("No Agent data available in this dataset.")
+        if rule_tabs[3].open:
+            agent_rules()